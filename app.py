@@ -7,6 +7,8 @@ from datetime import datetime, timedelta
 import os
 import pytz
 from notion_handler import NotionHandler
+from models import posts_to_columns
+from mirror import LocalMirror, DEFAULT_MIRROR_PATH
 
 # 서울 타임존 설정
 SEOUL_TZ = pytz.timezone('Asia/Seoul')
@@ -43,20 +45,24 @@ st.markdown("---")
 def load_data():
     """Notion에서 데이터를 불러옵니다."""
     try:
+        # 로컬 미러가 있으면 변경분만 동기화한 뒤 미러에서 집계
+        mirror_path = os.getenv("MIRROR_PATH", DEFAULT_MIRROR_PATH)
+        if os.path.exists(mirror_path):
+            return load_data_from_mirror(mirror_path)
+        
         notion = NotionHandler()
         contents = notion.get_all_contents(days=365)
         
         if not contents:
             return pd.DataFrame()
         
-        # DataFrame 생성
-        df = pd.DataFrame(contents)
+        # DataFrame 생성 (Post 레코드 → 컬럼 배열로 한 번만 변환)
+        df = pd.DataFrame(posts_to_columns(contents))
         
         # 날짜 파싱
-        df['published_date'] = df['published_date'].apply(
-            lambda x: str(x).split('T')[0] if 'T' in str(x) else str(x)
+        df['published_date'] = pd.to_datetime(
+            df['published_date'].str.split('T').str[0], errors='coerce'
         )
-        df['published_date'] = pd.to_datetime(df['published_date'], errors='coerce')
         df = df.dropna(subset=['published_date'])
         
         # 날짜별 카운트
@@ -68,6 +74,33 @@ def load_data():
         st.error(f"❌ 데이터 로드 실패: {str(e)}")
         return pd.DataFrame()
 
+def load_data_from_mirror(mirror_path):
+    """
+    로컬 미러에서 최근 1년간 날짜별 카운트를 불러옵니다.
+    
+    Notion 동기화에 실패해도(장애, 429, 설정 누락) 경고만 표시하고 기존 미러로 집계합니다.
+    """
+    mirror = LocalMirror(mirror_path)
+    try:
+        try:
+            mirror.sync(NotionHandler())
+        except Exception as e:
+            st.warning(f"⚠️ Notion 동기화 실패: 마지막으로 동기화한 로컬 미러를 표시합니다 ({str(e)})")
+        
+        start_date = (datetime.now(SEOUL_TZ) - timedelta(days=365)).strftime("%Y-%m-%d")
+        rows = mirror.count(group_by="date", start=start_date)
+    finally:
+        mirror.close()
+    
+    if not rows:
+        return pd.DataFrame()
+    
+    date_counts = pd.DataFrame(rows, columns=['published_date', 'count'])
+    date_counts['published_date'] = pd.to_datetime(date_counts['published_date'], errors='coerce')
+    date_counts = date_counts.dropna(subset=['published_date'])
+    
+    return date_counts.set_index('published_date')
+
 def create_heatmap(df_counts):
     """GitHub 스타일의 히트맵을 생성합니다 (오늘이 가장 끝에 오도록)."""
     # 서울 시간 기준 오늘
@@ -233,6 +266,10 @@ else:
 # 새로고침 버튼
 st.markdown("---")
 if st.button("🔄 데이터 새로고침"):
+    try:
+        NotionHandler().clear_cache()
+    except ValueError:
+        pass
     st.cache_data.clear()
     st.rerun()
 
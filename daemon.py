@@ -0,0 +1,280 @@
+"""
+SNS Content Tracker - 데몬 모드
+
+`python main.py --daemon`으로 실행되는 상주 프로세스입니다.
+Notion 세션, URL 인덱스, 피드 검증값을 메모리에 유지한 채 주기적으로 수집하고,
+상태를 디스크에 체크포인트하며, 로컬 헬스/메트릭 엔드포인트를 제공합니다.
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from main import collect_tistory, get_tistory_urls, select_due_blogs
+from dedup import NearDuplicateIndex
+from notion_handler import NotionHandler
+from scheduler import PollScheduler
+from scrapers import TistoryScraper
+
+# 기본 체크포인트 파일 경로
+DEFAULT_STATE_PATH = "data/daemon_state.json"
+
+
+class TrackerDaemon:
+    """주기적으로 콘텐츠를 수집하는 상주 프로세스"""
+
+    def __init__(self, interval_minutes: float = 15, state_path: Optional[str] = None,
+                 host: Optional[str] = None, port: Optional[int] = None,
+                 rebuild_hours: Optional[float] = None):
+        """
+        Args:
+            interval_minutes: 수집 주기 (분)
+            state_path: 체크포인트 파일 경로 (기본값: DAEMON_STATE_PATH 환경변수 또는 DEFAULT_STATE_PATH)
+            host: 헬스/메트릭 서버 주소 (기본값: DAEMON_HOST 환경변수 또는 127.0.0.1)
+            port: 헬스/메트릭 서버 포트 (기본값: DAEMON_PORT 환경변수 또는 8787, 0이면 비활성화)
+            rebuild_hours: 중복 체크 인덱스 전체 재구성 주기
+                (시간, 기본값: DAEMON_INDEX_REBUILD_HOURS 환경변수 또는 24, 0이면 비활성화)
+        """
+        self.interval = interval_minutes * 60
+        self.state_path = state_path or os.getenv("DAEMON_STATE_PATH", DEFAULT_STATE_PATH)
+        self.host = host or os.getenv("DAEMON_HOST", "127.0.0.1")
+        self.port = port if port is not None else int(os.getenv("DAEMON_PORT", "8787"))
+        self.rebuild_hours = rebuild_hours if rebuild_hours is not None \
+            else float(os.getenv("DAEMON_INDEX_REBUILD_HOURS", "24"))
+
+        self.stop_event = threading.Event()
+        self.notion = NotionHandler()
+        self.scheduler = PollScheduler()
+        self.scrapers: Dict[str, TistoryScraper] = {}
+        self.index_cursor: Optional[str] = None
+        # 마지막으로 인덱스를 전체 조회로 만든 시각 (ISO 8601)
+        self.index_built_at: Optional[str] = None
+
+        self.metrics = {
+            "cycles_total": 0,
+            "cycle_errors_total": 0,
+            "posts_new_total": 0,
+            "posts_existing_total": 0,
+            "last_cycle_duration_seconds": 0.0,
+            "last_cycle_timestamp": 0.0,
+        }
+        self.started_at = time.time()
+
+    # ===========================================
+    # 체크포인트
+    # ===========================================
+
+    def load_checkpoint(self):
+        """디스크에 저장된 중복 체크 인덱스와 피드 검증값을 복원합니다."""
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            print("ℹ️  체크포인트 없음: URL 인덱스를 새로 만듭니다.")
+            return
+
+        # 인덱스를 한 번이라도 완전히 불러온 체크포인트만 복원
+        # (제목이 페이지 ID 기준으로 저장되지 않은 이전 형식이면 전체를 다시 조회)
+        if isinstance(state.get("titles"), dict) and state.get("index_cursor"):
+            self.notion.url_index = set(state.get("url_index", []))
+            self.notion.title_index = NearDuplicateIndex.from_env()
+            for page_id, (title, published_date) in state["titles"].items():
+                self.notion.title_index.add(page_id, title, published_date)
+            self.index_cursor = state.get("index_cursor")
+            self.index_built_at = state.get("index_built_at")
+
+        for blog_url, validators in state.get("feed_validators", {}).items():
+            scraper = TistoryScraper(blog_url)
+            scraper.etag = validators.get("etag")
+            scraper.modified = validators.get("modified")
+            self.scrapers[blog_url] = scraper
+
+        print(f"♻️  체크포인트 복원: URL {len(self.notion.url_index or ())}개, 피드 {len(self.scrapers)}개")
+
+    def save_checkpoint(self):
+        """중복 체크 인덱스, 피드 검증값, 스케줄 상태를 디스크에 저장합니다."""
+        state = {
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "index_cursor": self.index_cursor,
+            "index_built_at": self.index_built_at,
+            "url_index": sorted(self.notion.url_index or ()),
+            "titles": self.notion.title_index.items() if self.notion.title_index else {},
+            "feed_validators": {
+                blog_url: {"etag": scraper.etag, "modified": scraper.modified}
+                for blog_url, scraper in self.scrapers.items()
+            },
+        }
+
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+        self.scheduler.save()
+
+    # ===========================================
+    # 수집 주기
+    # ===========================================
+
+    def rebuild_due(self, now: Optional[datetime] = None) -> bool:
+        """
+        중복 체크 인덱스를 전체 조회로 다시 만들 때가 되었는지 확인합니다.
+
+        증분 조회는 Notion에서 삭제되거나 URL이 바뀐 페이지를 알 수 없어
+        인덱스에 오래된 항목이 남으므로 rebuild_hours마다 새로 만듭니다.
+        """
+        if self.rebuild_hours <= 0 or self.index_cursor is None:
+            return False
+        if not self.index_built_at:
+            return True
+
+        now = now or datetime.now(timezone.utc)
+        return now - datetime.fromisoformat(self.index_built_at) >= timedelta(hours=self.rebuild_hours)
+
+    def refresh_index(self):
+        """중복 체크 인덱스를 변경분만 반영하거나, 재구성 주기가 되었으면 새로 만듭니다."""
+        if self.rebuild_due():
+            print("🧹 중복 체크 인덱스 재구성: 전체를 다시 조회합니다.")
+            self.notion.url_index = None
+            self.notion.title_index = None
+            self.index_cursor = None
+
+        full = self.index_cursor is None
+        # 다른 작업이 추가한 페이지까지 인덱스에 반영 (변경분만 조회)
+        self.index_cursor = self.notion.load_dedup_index(self.index_cursor)
+        if full:
+            self.index_built_at = datetime.now(timezone.utc).isoformat()
+
+    def run_cycle(self):
+        """한 번의 수집 주기를 실행합니다."""
+        started = time.time()
+        print("=" * 60)
+        print(f"🔁 수집 주기 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("=" * 60)
+
+        try:
+            due_urls = select_due_blogs(get_tistory_urls(), self.scheduler)
+            if due_urls:
+                self.refresh_index()
+
+                stats = collect_tistory(
+                    self.notion, due_urls,
+                    scheduler=self.scheduler, scrapers=self.scrapers
+                )
+                self.metrics["posts_new_total"] += stats["new"]
+                self.metrics["posts_existing_total"] += stats["existing"]
+                self.metrics["cycle_errors_total"] += stats["errors"]
+        except Exception as e:
+            print(f"❌ 수집 주기 실패: {e}")
+            self.metrics["cycle_errors_total"] += 1
+
+        try:
+            self.save_checkpoint()
+        except OSError as e:
+            print(f"⚠️  체크포인트 저장 실패: {e}")
+
+        self.metrics["cycles_total"] += 1
+        self.metrics["last_cycle_duration_seconds"] = round(time.time() - started, 3)
+        self.metrics["last_cycle_timestamp"] = time.time()
+        print(f"✅ 수집 주기 완료 ({self.metrics['last_cycle_duration_seconds']}초)\n")
+
+    # ===========================================
+    # 헬스/메트릭 서버
+    # ===========================================
+
+    def health(self) -> Dict:
+        """헬스 상태를 반환합니다 (마지막 주기가 3주기 이상 지났으면 stale)."""
+        last = self.metrics["last_cycle_timestamp"]
+        stale = bool(last) and time.time() - last > self.interval * 3
+        return {
+            "status": "stale" if stale else "ok",
+            "uptime_seconds": round(time.time() - self.started_at),
+            "cycles_total": self.metrics["cycles_total"],
+            "last_cycle_at": datetime.fromtimestamp(last, timezone.utc).isoformat() if last else None,
+        }
+
+    def render_metrics(self) -> str:
+        """Prometheus 텍스트 형식의 메트릭을 반환합니다."""
+        values = dict(self.metrics)
+        values["url_index_size"] = len(self.notion.url_index or ())
+        values["title_index_size"] = len(self.notion.title_index or ())
+        values["feeds_tracked"] = len(self.scrapers)
+        return "".join(f"sns_tracker_{name} {value}\n" for name, value in values.items())
+
+    def start_http_server(self) -> Optional[ThreadingHTTPServer]:
+        """헬스/메트릭 엔드포인트를 백그라운드 스레드로 실행합니다."""
+        if not self.port:
+            return None
+
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/healthz":
+                    health = daemon.health()
+                    body = json.dumps(health).encode()
+                    status = 200 if health["status"] == "ok" else 503
+                    content_type = "application/json"
+                elif self.path == "/metrics":
+                    body = daemon.render_metrics().encode()
+                    status = 200
+                    content_type = "text/plain; version=0.0.4"
+                else:
+                    body = b"not found\n"
+                    status = 404
+                    content_type = "text/plain"
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((self.host, self.port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"🩺 헬스/메트릭 엔드포인트: http://{self.host}:{self.port}/healthz, /metrics")
+        return server
+
+    # ===========================================
+    # 실행
+    # ===========================================
+
+    def stop(self, signum=None, frame=None):
+        """종료를 요청합니다 (진행 중인 주기는 끝까지 실행)."""
+        print("\n🛑 종료 신호 수신: 현재 주기를 마치고 종료합니다.")
+        self.stop_event.set()
+
+    def run(self):
+        """종료 신호를 받을 때까지 수집 주기를 반복합니다."""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        print("🚀 SNS Content Tracker 데몬 시작")
+        print(f"⏱️  수집 주기: {self.interval / 60:g}분\n")
+
+        self.load_checkpoint()
+        server = self.start_http_server()
+
+        try:
+            while not self.stop_event.is_set():
+                self.run_cycle()
+                self.stop_event.wait(self.interval)
+        finally:
+            if server:
+                server.shutdown()
+            self.save_checkpoint()
+            self.notion.session.close()
+            for scraper in self.scrapers.values():
+                scraper.session.close()
+            print("✨ 데몬 종료")
@@ -0,0 +1,236 @@
+"""
+SNS Content Tracker - 유사 제목 중복 탐지
+
+제목을 정규화한 문자 n-gram 집합에 MinHash/LSH를 적용해
+교차 게시되거나 살짝 수정된 제목을 게시물 간 전수 비교 없이 찾아냅니다.
+"""
+
+import os
+import random
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+from datetime import date
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+# MinHash 해시 함수 개수 = 밴드 수 × 밴드당 행 수
+NUM_BANDS = 8
+ROWS_PER_BAND = 4
+
+# 문자 n-gram 길이
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_TOKEN_PATTERN = re.compile(r"\w+")
+_NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def normalize_title(title: str) -> str:
+    """
+    제목을 비교용으로 정규화합니다.
+    - 유니코드 NFKC 정규화 및 소문자 변환
+    - 문장부호/기호 제거, 공백 하나로 통일
+    """
+    text = unicodedata.normalize("NFKC", title or "").lower()
+    return " ".join(_TOKEN_PATTERN.findall(text))
+
+
+def title_shingles(title: str) -> FrozenSet[str]:
+    """정규화된 제목의 문자 n-gram 집합을 반환합니다."""
+    text = normalize_title(title)
+    if len(text) <= SHINGLE_SIZE:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+
+
+def title_numbers(title: str) -> FrozenSet[str]:
+    """
+    제목에 포함된 숫자 집합을 반환합니다.
+
+    "강좌 1편" / "강좌 2편"처럼 숫자만 다른 연재 제목을 중복으로 보지 않기 위해 사용합니다.
+    """
+    return frozenset(_NUMBER_PATTERN.findall(normalize_title(title)))
+
+
+def _parse_day(published_date: str) -> Optional[int]:
+    """발행일 문자열을 날짜 서수(ordinal)로 변환합니다."""
+    try:
+        return date.fromisoformat((published_date or "")[:10]).toordinal()
+    except ValueError:
+        return None
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH 기반 유사 제목 인덱스"""
+
+    def __init__(self, threshold: float = 0.8, window_days: int = 1, seed: int = 42):
+        """
+        Args:
+            threshold: 중복으로 볼 최소 자카드 유사도 (0~1)
+            window_days: 발행일 차이가 이 일수 이내일 때만 중복으로 간주
+            seed: MinHash 해시 함수 생성용 시드
+        """
+        self.threshold = threshold
+        self.window_days = window_days
+
+        rng = random.Random(seed)
+        num_perm = NUM_BANDS * ROWS_PER_BAND
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        # (밴드 번호, 밴드 해시) → 날짜 버킷 → 엔트리 키 집합
+        # 같은 제목이 반복 게시되어도 발행일이 가까운 엔트리만 후보가 되도록 날짜로 한 번 더 나눔
+        self._buckets: Dict[Tuple[int, int], Dict[Optional[int], Set[str]]] = \
+            defaultdict(lambda: defaultdict(set))
+        # 엔트리 키(페이지 ID) → (제목, 발행일, 발행일 서수, n-gram 집합, 숫자 집합, 버킷 키 목록)
+        self._entries: Dict[str, Tuple[str, str, Optional[int], FrozenSet[str],
+                                       FrozenSet[str], List[Tuple[int, int]]]] = {}
+
+    @classmethod
+    def from_env(cls) -> "NearDuplicateIndex":
+        """
+        환경변수 설정으로 인덱스를 생성합니다.
+        - TITLE_DEDUP_THRESHOLD: 최소 유사도 (기본 0.8)
+        - TITLE_DEDUP_WINDOW_DAYS: 발행일 허용 범위 (기본 1일)
+        """
+        return cls(
+            threshold=float(os.getenv("TITLE_DEDUP_THRESHOLD", "0.8")),
+            window_days=int(os.getenv("TITLE_DEDUP_WINDOW_DAYS", "1"))
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def items(self) -> Dict[str, Tuple[str, str]]:
+        """인덱스에 들어 있는 엔트리 키 → (제목, 발행일)을 반환합니다 (체크포인트용)."""
+        return {key: (entry[0], entry[1]) for key, entry in self._entries.items()}
+
+    def _signature(self, shingles: FrozenSet[str]) -> List[int]:
+        """n-gram 집합의 MinHash 시그니처를 계산합니다."""
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+        return [
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._perms
+        ]
+
+    def _date_bucket(self, day: Optional[int]) -> Optional[int]:
+        """발행일 서수를 window_days 단위 날짜 버킷으로 바꿉니다 (발행일을 모르면 None)."""
+        if day is None:
+            return None
+        return day // max(self.window_days, 1)
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, int]]:
+        """시그니처를 밴드 단위 버킷 키로 나눕니다."""
+        return [
+            (band, hash(tuple(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])))
+            for band in range(NUM_BANDS)
+        ]
+
+    def add(self, key: str, title: str, published_date: str):
+        """
+        제목을 인덱스에 추가합니다.
+
+        같은 키가 이미 있으면 기존 엔트리를 교체하므로, 같은 페이지를 다시 추가하거나
+        제목이 수정된 페이지를 반영해도 엔트리가 늘어나지 않습니다.
+
+        Args:
+            key: 엔트리 키 (Notion 페이지 ID)
+            title: 제목
+            published_date: 발행일 (YYYY-MM-DD로 시작하는 문자열)
+        """
+        self.remove(key)
+
+        shingles = title_shingles(title)
+        if not shingles:
+            return
+
+        day = _parse_day(published_date)
+        band_keys = self._band_keys(self._signature(shingles))
+        self._entries[key] = (
+            title, published_date, day, shingles, title_numbers(title), band_keys
+        )
+        date_bucket = self._date_bucket(day)
+        for band_key in band_keys:
+            self._buckets[band_key][date_bucket].add(key)
+
+    def remove(self, key: str):
+        """엔트리를 인덱스에서 제거합니다 (없으면 무시)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        date_bucket = self._date_bucket(entry[2])
+        for band_key in entry[5]:
+            by_date = self._buckets[band_key]
+            by_date[date_bucket].discard(key)
+            if not by_date[date_bucket]:
+                del by_date[date_bucket]
+            if not by_date:
+                del self._buckets[band_key]
+
+    def _candidates(self, band_key: Tuple[int, int], day: Optional[int]) -> List[Set[str]]:
+        """
+        밴드 버킷에서 발행일 범위 안에 들 수 있는 엔트리 키 집합들을 반환합니다.
+
+        날짜 버킷 크기가 window_days이므로 앞뒤 버킷까지만 보면 되고,
+        발행일을 모르는 엔트리(None 버킷)는 항상 포함합니다.
+        발행일을 모르는 제목은 모든 날짜 버킷을 확인합니다.
+        """
+        by_date = self._buckets.get(band_key)
+        if not by_date:
+            return []
+        if day is None:
+            return list(by_date.values())
+
+        date_bucket = self._date_bucket(day)
+        return [
+            by_date[bucket]
+            for bucket in (date_bucket - 1, date_bucket, date_bucket + 1, None)
+            if bucket in by_date
+        ]
+
+    def find(self, title: str, published_date: str) -> Optional[str]:
+        """
+        발행일 기준 window_days 이내에 게시된 유사 제목을 찾습니다.
+
+        같은 LSH 버킷에 들어간 후보만 실제 자카드 유사도로 검증하며,
+        제목에 포함된 숫자가 다르면 연재물로 보고 중복에서 제외합니다.
+
+        Args:
+            title: 확인할 제목
+            published_date: 발행일
+
+        Returns:
+            Optional[str]: 중복으로 판단된 기존 제목 (없으면 None)
+        """
+        shingles = title_shingles(title)
+        if not shingles:
+            return None
+
+        day = _parse_day(published_date)
+        numbers = title_numbers(title)
+        checked = set()
+
+        for band_key in self._band_keys(self._signature(shingles)):
+            for keys in self._candidates(band_key, day):
+                for key in keys:
+                    if key in checked:
+                        continue
+                    checked.add(key)
+
+                    existing_title, _, existing_day, existing_shingles, existing_numbers, _ = \
+                        self._entries[key]
+                    if day is not None and existing_day is not None \
+                            and abs(day - existing_day) > self.window_days:
+                        continue
+                    if numbers != existing_numbers:
+                        continue
+
+                    similarity = len(shingles & existing_shingles) / len(shingles | existing_shingles)
+                    if similarity >= self.threshold:
+                        return existing_title
+
+        return None
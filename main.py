@@ -5,13 +5,179 @@ SNS Content Tracker - 메인 실행 파일
 모든 플랫폼에서 콘텐츠를 수집하고 Notion 데이터베이스에 저장합니다.
 """
 
+import argparse
 import os
+import time
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from notion_handler import NotionHandler
+from scheduler import PollScheduler
 from scrapers import TistoryScraper
+from shards import parse_shard, report_path, select_shard, write_report
 
-def main():
-    """메인 실행 함수"""
+def parse_args():
+    """명령행 인자를 파싱합니다."""
+    parser = argparse.ArgumentParser(description="SNS Content Tracker")
+    parser.add_argument(
+        "--scheduled",
+        action="store_true",
+        help="블로그별 발행 주기에 따라 수집할 차례가 된 블로그만 수집"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="상주 모드로 실행 (주기적 수집, 상태 체크포인트, 헬스/메트릭 엔드포인트)"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=float(os.getenv("DAEMON_INTERVAL_MINUTES", "15")),
+        help="데몬 모드 수집 주기 (분, 기본 15)"
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="i/N",
+        help="블로그를 N개 샤드로 나눠 i번째 샤드만 수집 (Notion 요청 속도도 1/N로 제한)"
+    )
+    parser.add_argument(
+        "--report",
+        help="실행 결과 리포트 저장 경로 (샤드 모드 기본값: reports/shard-i-of-N.json)"
+    )
+    return parser.parse_args()
+
+def get_tistory_urls() -> List[str]:
+    """
+    TISTORY_BLOGS 환경변수에서 티스토리 블로그 URL 목록을 가져옵니다.
+    
+    Returns:
+        List[str]: 블로그 URL 목록 (설정되지 않았으면 빈 리스트)
+    """
+    # GitHub Secrets에서 티스토리 블로그 URL들 가져오기 (여러 블로그 지원)
+    tistory_blogs_str = os.getenv('TISTORY_BLOGS')
+    
+    if not tistory_blogs_str:
+        print("⚠️  TISTORY_BLOGS 환경변수가 설정되지 않았습니다.")
+        print("   - GitHub Repository Settings → Secrets → Actions에서")
+        print("   - TISTORY_BLOGS 변수를 추가해주세요")
+        print("   - 여러 블로그는 콤마로 구분: https://blog1.tistory.com,https://blog2.tistory.com\n")
+        return []
+    
+    # 콤마로 구분된 블로그 URL들을 리스트로 변환 (공백 제거)
+    return [url.strip() for url in tistory_blogs_str.split(',')]
+
+def select_due_blogs(tistory_urls: List[str], scheduler: Optional[PollScheduler]) -> List[str]:
+    """
+    적응형 스케줄에서 수집할 차례가 된 블로그만 남깁니다 (스케줄러가 없으면 전체).
+    
+    중복 체크 인덱스 로드 등 Notion 조회보다 먼저 호출해,
+    수집할 블로그가 없으면 Notion 요청 없이 끝낼 수 있도록 합니다.
+    """
+    if not scheduler:
+        return tistory_urls
+    
+    due_urls = scheduler.due_blogs(tistory_urls)
+    print(f"⏱️  스케줄 모드: {len(tistory_urls)}개 중 {len(due_urls)}개 블로그 수집 차례\n")
+    return due_urls
+
+def collect_tistory(notion: NotionHandler, tistory_urls: List[str],
+                    scheduler: Optional[PollScheduler] = None,
+                    scrapers: Optional[Dict[str, TistoryScraper]] = None) -> Dict[str, int]:
+    """
+    티스토리 블로그들의 포스트를 수집해 Notion에 저장합니다.
+    
+    Args:
+        notion: NotionHandler 인스턴스
+        tistory_urls: 블로그 URL 목록
+        scheduler: 적응형 스케줄러 (있으면 수집 결과로 다음 수집 시각을 갱신)
+        scrapers: 블로그 URL → 스크래퍼 캐시 (데몬 모드에서 피드 검증값 유지용)
+    
+    Returns:
+        Dict[str, int]: 처리 통계 (new, existing, errors)
+    """
+    stats = {"new": 0, "existing": 0, "errors": 0}
+    
+    print(f"📋 총 {len(tistory_urls)}개의 티스토리 블로그 수집 예정")
+    print(f"   블로그 목록: {', '.join(tistory_urls)}\n")
+    
+    # 각 티스토리 블로그별로 처리
+    for blog_idx, tistory_url in enumerate(tistory_urls, 1):
+        print(f"📘 [{blog_idx}/{len(tistory_urls)}] {tistory_url} 처리 중...")
+        print("-" * 40)
+        
+        try:
+            tistory = scrapers.get(tistory_url) if scrapers is not None else None
+            if tistory is None:
+                tistory = TistoryScraper(tistory_url)
+                if scrapers is not None:
+                    scrapers[tistory_url] = tistory
+            
+            # 최근 100개 포스트 가져오기
+            print(f"🔍 RSS 피드 수집 중... ({tistory_url}/rss)")
+            posts = tistory.fetch_posts(limit=100)
+            print(f"📝 RSS에서 {len(posts)}개 포스트 발견\n")
+            
+            # 수집에 실패한 블로그는 스케줄을 갱신하지 않아 다음 실행에서 바로 다시 수집
+            if tistory.fetch_failed:
+                print("⚠️  피드를 가져오지 못해 다음 실행에서 다시 시도합니다.\n")
+                stats["errors"] += 1
+                continue
+            
+            if scheduler:
+                next_due = scheduler.record(tistory_url, posts)
+                print(f"⏱️  다음 수집 예정: {next_due.strftime('%Y-%m-%d %H:%M')} (UTC)\n")
+            
+            if not posts and not tistory.not_modified:
+                print("⚠️  수집된 포스트가 없습니다.")
+                print("   - RSS 피드 URL이 올바른지 확인해주세요")
+                print("   - 블로그에 게시된 글이 있는지 확인해주세요\n")
+            
+            # 각 포스트 처리
+            failures_before = notion.write_failures
+            for i, post in enumerate(posts, 1):
+                print(f"[{i}/{len(posts)}] 처리 중: {post.title[:40]}...")
+                
+                try:
+                    success = notion.add_post(post)
+                    
+                    if success:
+                        stats["new"] += 1
+                    else:
+                        stats["existing"] += 1
+                        
+                except Exception as e:
+                    print(f"   ❌ 처리 중 오류: {str(e)}")
+                    stats["errors"] += 1
+                    tistory.reset_validators()
+            
+            # 저장에 실패한 포스트가 있으면 다음 수집 때 피드를 다시 받도록 함
+            if notion.write_failures > failures_before:
+                tistory.reset_validators()
+            
+            print(f"✅ {tistory_url} 처리 완료\n")
+            
+        except Exception as e:
+            print(f"❌ {tistory_url} 스크래핑 실패: {e}")
+            print("   - 블로그 URL이 올바른지 확인해주세요")
+            print("   - 네트워크 연결을 확인해주세요\n")
+            stats["errors"] += 1
+    
+    if scheduler:
+        scheduler.save()
+    
+    return stats
+
+def main(scheduled: bool = False, shard: Optional[Tuple[int, int]] = None,
+         report: Optional[str] = None):
+    """
+    메인 실행 함수
+    
+    Args:
+        scheduled: True이면 적응형 스케줄러로 수집 대상 블로그를 고릅니다.
+        shard: (샤드 번호, 전체 샤드 수) - 지정하면 해당 샤드의 블로그만 수집합니다.
+        report: 실행 결과 리포트(JSON) 저장 경로
+    """
+    started = time.time()
     print("=" * 60)
     print("🚀 SNS Content Tracker 시작")
     print(f"⏰ 실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -29,78 +195,44 @@ def main():
         print(f"❌ 예상치 못한 오류: {e}")
         return
     
-    # 통계 변수
-    total_new = 0
-    total_existing = 0
-    total_errors = 0
-    
     # ===========================================
     # 티스토리 블로그 크롤링
     # ===========================================
     print("📘 티스토리 블로그 수집 중...")
     print("-" * 60)
     
-    # GitHub Secrets에서 티스토리 블로그 URL들 가져오기 (여러 블로그 지원)
-    tistory_blogs_str = os.getenv('TISTORY_BLOGS')
+    stats = {"new": 0, "existing": 0, "errors": 0}
+    tistory_urls = get_tistory_urls()
     
-    if not tistory_blogs_str:
-        print("⚠️  TISTORY_BLOGS 환경변수가 설정되지 않았습니다.")
-        print("   - GitHub Repository Settings → Secrets → Actions에서")
-        print("   - TISTORY_BLOGS 변수를 추가해주세요")
-        print("   - 여러 블로그는 콤마로 구분: https://blog1.tistory.com,https://blog2.tistory.com\n")
-    else:
-        # 콤마로 구분된 블로그 URL들을 리스트로 변환 (공백 제거)
-        tistory_urls = [url.strip() for url in tistory_blogs_str.split(',')]
-        
-        print(f"📋 총 {len(tistory_urls)}개의 티스토리 블로그 수집 예정")
-        print(f"   블로그 목록: {', '.join(tistory_urls)}\n")
+    # 샤드 모드: 이 샤드의 블로그만 남기고 Notion 요청 속도 예산을 샤드 수로 나눔
+    if shard:
+        shard_index, shard_total = shard
+        tistory_urls = select_shard(tistory_urls, shard_index, shard_total)
+        notion.set_rate_share(shard_total)
+        # 교차 게시 글이 다른 샤드에서 먼저 저장됐을 수 있으므로 저장 직전에 제목을 다시 확인
+        notion.recheck_titles = True
+        print(f"🧩 샤드 {shard_index}/{shard_total}: 블로그 {len(tistory_urls)}개 담당\n")
+        report = report or report_path(shard_index, shard_total)
+    
+    scheduler = PollScheduler() if scheduled else None
+    due_urls = select_due_blogs(tistory_urls, scheduler)
+    
+    if due_urls:
+        # 중복 체크 인덱스를 한 번만 만들어 포스트마다 Notion을 조회하지 않도록 함
+        try:
+            notion.load_dedup_index()
+            print(f"🗂️  중복 체크 인덱스: URL {len(notion.url_index)}개, 제목 {len(notion.title_index)}개\n")
+        except Exception as e:
+            print(f"⚠️  중복 체크 인덱스 생성 실패 (포스트별 조회로 진행): {e}\n")
         
-        # 각 티스토리 블로그별로 처리
-        for blog_idx, tistory_url in enumerate(tistory_urls, 1):
-            print(f"📘 [{blog_idx}/{len(tistory_urls)}] {tistory_url} 처리 중...")
-            print("-" * 40)
-            
-            try:
-                tistory = TistoryScraper(tistory_url)
-                
-                # 최근 100개 포스트 가져오기
-                print(f"🔍 RSS 피드 수집 중... ({tistory_url}/rss)")
-                posts = tistory.fetch_posts(limit=100)
-                print(f"📝 RSS에서 {len(posts)}개 포스트 발견\n")
-                
-                if not posts:
-                    print("⚠️  수집된 포스트가 없습니다.")
-                    print("   - RSS 피드 URL이 올바른지 확인해주세요")
-                    print("   - 블로그에 게시된 글이 있는지 확인해주세요\n")
-                
-                # 각 포스트 처리
-                for i, post in enumerate(posts, 1):
-                    print(f"[{i}/{len(posts)}] 처리 중: {post['title'][:40]}...")
-                    
-                    try:
-                        success = notion.add_content(
-                            title=post['title'],
-                            url=post['url'],
-                            published_date=post['published_date'],
-                            platform=post['platform']
-                        )
-                        
-                        if success:
-                            total_new += 1
-                        else:
-                            total_existing += 1
-                            
-                    except Exception as e:
-                        print(f"   ❌ 처리 중 오류: {str(e)}")
-                        total_errors += 1
-                
-                print(f"✅ {tistory_url} 처리 완료\n")
-                
-            except Exception as e:
-                print(f"❌ {tistory_url} 스크래핑 실패: {e}")
-                print("   - 블로그 URL이 올바른지 확인해주세요")
-                print("   - 네트워크 연결을 확인해주세요\n")
-                total_errors += 1
+        stats = collect_tistory(notion, due_urls, scheduler=scheduler)
+    elif tistory_urls:
+        print("💤 수집할 차례가 된 블로그가 없습니다.\n")
+    
+    # 통계 변수
+    total_new = stats["new"]
+    total_existing = stats["existing"]
+    total_errors = stats["errors"]
     
     # ===========================================
     # 향후 추가할 플랫폼들
@@ -133,17 +265,32 @@ def main():
     print("=" * 60)
     print()
     
+    # 실행 결과 리포트 저장 (샤드 병합용)
+    if report:
+        write_report(report, {
+            "shard": shard[0] if shard else 1,
+            "total_shards": shard[1] if shard else 1,
+            "blogs": tistory_urls,
+            "new": total_new,
+            "existing": total_existing,
+            "errors": total_errors,
+            "notion_requests": notion.request_count,
+            "rate_limited": notion.rate_limited_count,
+            "duration_seconds": round(time.time() - started, 1),
+        })
+        print(f"🧾 리포트 저장: {report}\n")
+    
     # 최근 데이터 확인
     if total_new > 0 or total_existing > 0:
         print("📋 최근 5개 콘텐츠:")
         print("-" * 60)
         try:
-            recent_contents = notion.get_all_contents(days=30)
+            recent_contents = notion.get_all_contents(days=30, limit=5)
             
             if recent_contents:
                 for i, content in enumerate(recent_contents[:5], 1):
-                    print(f"{i}. [{content['platform']}] {content['title'][:50]}")
-                    print(f"   📅 {content['published_date']} | 🔗 {content['url'][:50]}...")
+                    print(f"{i}. [{content.platform}] {content.title[:50]}")
+                    print(f"   📅 {content.published_date} | 🔗 {content.url[:50]}...")
                     print()
             else:
                 print("   (조회된 콘텐츠가 없습니다)\n")
@@ -157,4 +304,10 @@ def main():
     print(f"\n💡 다음 자동 실행은 GitHub Actions에 설정된 스케줄에 따라 진행됩니다.")
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    
+    if args.daemon:
+        from daemon import TrackerDaemon
+        TrackerDaemon(interval_minutes=args.interval).run()
+    else:
+        main(scheduled=args.scheduled, shard=args.shard, report=args.report)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+SNS Content Tracker - 로컬 미러
+
+Notion 데이터베이스를 로컬 SQLite 파일로 미러링하고,
+미러 위에서 기간/플랫폼/그룹별 집계 쿼리를 제공합니다.
+
+사용법:
+    python mirror.py sync
+    python mirror.py query --group-by month --start 2024-01-01
+"""
+
+import argparse
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from models import Post
+
+# 기본 미러 파일 경로
+DEFAULT_MIRROR_PATH = "data/notion_mirror.sqlite3"
+
+# 그룹 기준 → SQL 표현식
+GROUP_BY_EXPRESSIONS = {
+    "date": "substr(published_date, 1, 10)",
+    "month": "substr(published_date, 1, 7)",
+    "weekday": "strftime('%w', substr(published_date, 1, 10))",
+    "platform": "platform",
+}
+
+
+class LocalMirror:
+    """Notion 데이터베이스의 로컬 SQLite 미러를 관리하는 클래스"""
+
+    def __init__(self, path: Optional[str] = None, reconcile_days: Optional[float] = None):
+        """
+        Args:
+            path: 미러 파일 경로 (기본값: MIRROR_PATH 환경변수 또는 DEFAULT_MIRROR_PATH)
+            reconcile_days: 전체 동기화 주기 (일, 기본값: MIRROR_RECONCILE_DAYS 환경변수 또는 1, 0이면 비활성화)
+        """
+        self.path = path or os.getenv("MIRROR_PATH", DEFAULT_MIRROR_PATH)
+        self.reconcile_days = reconcile_days if reconcile_days is not None \
+            else float(os.getenv("MIRROR_RECONCILE_DAYS", "1"))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.path)
+        self._create_schema()
+
+    def _create_schema(self):
+        """테이블과 인덱스를 생성합니다."""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS posts (
+                page_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                url TEXT NOT NULL,
+                url_key TEXT NOT NULL,
+                published_date TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                last_edited_time TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_posts_published_date ON posts (published_date);
+            CREATE INDEX IF NOT EXISTS idx_posts_platform ON posts (platform, published_date);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        """meta 테이블 값을 반환합니다."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def last_synced(self) -> Optional[str]:
+        """마지막으로 반영한 last_edited_time을 반환합니다."""
+        return self._get_meta("last_edited_time")
+
+    def reconcile_due(self, now: Optional[datetime] = None) -> bool:
+        """
+        마지막 전체 동기화 후 reconcile_days가 지났는지 확인합니다.
+
+        Notion 데이터베이스 조회는 보관/휴지통/삭제된 페이지를 반환하지 않아
+        증분 동기화로는 이런 페이지를 알 수 없으므로, 주기적으로 전체 동기화를 해 미러에서 지웁니다.
+        """
+        if self.reconcile_days <= 0:
+            return False
+
+        last_full = self._get_meta("last_full_sync")
+        if not last_full:
+            return True
+
+        now = now or datetime.now(timezone.utc)
+        return now - datetime.fromisoformat(last_full) >= timedelta(days=self.reconcile_days)
+
+    def sync(self, notion, full: bool = False) -> int:
+        """
+        Notion 데이터베이스의 변경분을 미러에 반영합니다.
+
+        last_edited_time 기준으로 증분 조회하며, 처음 실행하거나 full=True이거나
+        마지막 전체 동기화 후 reconcile_days가 지났으면 전체를 다시 가져옵니다.
+
+        Notion 조회는 보관/휴지통/삭제된 페이지를 반환하지 않으므로 증분 조회로는
+        이런 페이지를 알 수 없고, 다음 전체 동기화 전까지 미러와 집계에 남습니다.
+        전체 동기화에서는 조회되지 않은 페이지를 미러에서 지웁니다.
+
+        Args:
+            notion: NotionHandler 인스턴스
+            full: 전체 재동기화 여부
+
+        Returns:
+            int: 반영된 페이지 수
+        """
+        since = self.last_synced()
+        full = full or since is None or self.reconcile_due()
+        if full:
+            since = None
+
+        latest = since
+        changed = 0
+        seen = set()
+
+        # 캐시된 응답을 쓰면 TTL 동안의 변경분을 놓치므로 항상 Notion에서 조회
+        pages = notion.get_pages_edited_since(since, use_cache=False)
+        for page_id, edited_time, post in pages:
+            seen.add(page_id)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (page_id, post.title, post.url, post.url_key,
+                 post.published_date, post.platform, edited_time)
+            )
+            changed += 1
+            if edited_time and (latest is None or edited_time > latest):
+                latest = edited_time
+
+        if full:
+            # 전체 조회에 없는 페이지는 Notion에서 보관/휴지통/삭제된 것
+            removed = [
+                (page_id,) for (page_id,) in self.conn.execute("SELECT page_id FROM posts")
+                if page_id not in seen
+            ]
+            self.conn.executemany("DELETE FROM posts WHERE page_id = ?", removed)
+            changed += len(removed)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('last_full_sync', ?)",
+                (datetime.now(timezone.utc).isoformat(),)
+            )
+
+        if latest:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('last_edited_time', ?)", (latest,)
+            )
+        self.conn.commit()
+
+        mode = "전체" if full else "증분"
+        print(f"🗂️  미러 동기화({mode}): {changed}개 페이지 반영 ({self.path})")
+        return changed
+
+    def _where(self, start: Optional[str], end: Optional[str],
+               platform: Optional[str]) -> Tuple[str, list]:
+        """기간/플랫폼 조건절을 생성합니다."""
+        clauses = []
+        params = []
+
+        if start:
+            clauses.append("substr(published_date, 1, 10) >= ?")
+            params.append(start)
+        if end:
+            clauses.append("substr(published_date, 1, 10) <= ?")
+            params.append(end)
+        if platform:
+            clauses.append("platform = ?")
+            params.append(platform)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def posts(self, start: Optional[str] = None, end: Optional[str] = None,
+              platform: Optional[str] = None) -> List[Post]:
+        """
+        조건에 맞는 포스트를 발행일 내림차순으로 반환합니다.
+
+        Args:
+            start: 시작일 (YYYY-MM-DD, 포함)
+            end: 종료일 (YYYY-MM-DD, 포함)
+            platform: 플랫폼 이름 (정확히 일치)
+
+        Returns:
+            List[Post]: 포스트 목록
+        """
+        where, params = self._where(start, end, platform)
+        rows = self.conn.execute(
+            f"SELECT title, url, published_date, platform FROM posts {where} "
+            "ORDER BY published_date DESC",
+            params
+        )
+        return [Post(*row) for row in rows]
+
+    def count(self, group_by: str = "date", start: Optional[str] = None,
+              end: Optional[str] = None, platform: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        조건에 맞는 포스트 수를 그룹별로 집계합니다.
+
+        Args:
+            group_by: 그룹 기준 (date, month, weekday, platform)
+                - weekday는 일요일=0 ~ 토요일=6
+            start: 시작일 (YYYY-MM-DD, 포함)
+            end: 종료일 (YYYY-MM-DD, 포함)
+            platform: 플랫폼 이름 (정확히 일치)
+
+        Returns:
+            List[Tuple[str, int]]: (그룹 값, 개수) 목록
+        """
+        if group_by not in GROUP_BY_EXPRESSIONS:
+            raise ValueError(
+                f"group_by는 {', '.join(GROUP_BY_EXPRESSIONS)} 중 하나여야 합니다: {group_by}"
+            )
+
+        expr = GROUP_BY_EXPRESSIONS[group_by]
+        where, params = self._where(start, end, platform)
+        return self.conn.execute(
+            f"SELECT {expr} AS grp, COUNT(*) FROM posts {where} GROUP BY grp ORDER BY grp",
+            params
+        ).fetchall()
+
+    def close(self):
+        """연결을 닫습니다."""
+        self.conn.close()
+
+
+def main():
+    """미러 동기화/조회 명령을 실행합니다."""
+    parser = argparse.ArgumentParser(description="Notion 데이터베이스 로컬 미러")
+    parser.add_argument("--path", help="미러 파일 경로")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="Notion 변경분을 미러에 반영")
+    sync_parser.add_argument("--full", action="store_true", help="전체 재동기화")
+
+    query_parser = subparsers.add_parser("query", help="미러에서 집계 조회")
+    query_parser.add_argument("--group-by", default="date", choices=list(GROUP_BY_EXPRESSIONS))
+    query_parser.add_argument("--start", help="시작일 (YYYY-MM-DD)")
+    query_parser.add_argument("--end", help="종료일 (YYYY-MM-DD)")
+    query_parser.add_argument("--platform", help="플랫폼 이름")
+
+    args = parser.parse_args()
+    mirror = LocalMirror(args.path)
+
+    try:
+        if args.command == "sync":
+            from notion_handler import NotionHandler
+            mirror.sync(NotionHandler(), full=args.full)
+        else:
+            rows = mirror.count(args.group_by, args.start, args.end, args.platform)
+            for group, count in rows:
+                print(f"{group}\t{count}")
+    finally:
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+SNS Content Tracker - 공용 데이터 모델
+
+스크래퍼, Notion 핸들러, 대시보드가 함께 사용하는 포스트 레코드를 정의합니다.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+from urllib.parse import urlparse, urlunparse
+
+
+def normalize_url(url: str) -> str:
+    """
+    URL을 정규화합니다 (중복 체크 정확도 향상)
+    - 끝의 슬래시 제거
+    - 소문자 변환
+    - http/https 통일
+    """
+    if not url:
+        return ""
+
+    # URL 파싱
+    parsed = urlparse(url.lower().strip())
+
+    # path에서 끝의 슬래시 제거
+    path = parsed.path.rstrip('/')
+
+    # 재조립 (scheme, netloc, path만 사용)
+    return urlunparse((
+        parsed.scheme or 'https',
+        parsed.netloc,
+        path,
+        '',  # params
+        '',  # query
+        ''   # fragment
+    ))
+
+
+@dataclass(frozen=True, slots=True)
+class Post:
+    """
+    수집된 콘텐츠 한 건을 나타내는 불변 레코드
+
+    dict 대신 __slots__ 기반 레코드를 사용해 대량 조회 시 메모리를 줄입니다.
+    플랫폼 이름은 intern 되어 같은 블로그의 포스트끼리 문자열을 공유하고,
+    중복 체크용 정규화 URL(url_key)은 생성 시 한 번만 계산합니다.
+    """
+    title: str
+    url: str
+    published_date: str
+    platform: str
+    url_key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'platform', sys.intern(self.platform or ""))
+        object.__setattr__(self, 'url_key', normalize_url(self.url))
+
+
+def posts_to_columns(posts: Iterable[Post]) -> Dict[str, List[str]]:
+    """
+    포스트 목록을 컬럼 단위 리스트로 변환합니다.
+
+    DataFrame을 만들 때 행 단위 dict를 거치지 않도록 경계에서 한 번만 호출합니다.
+
+    Args:
+        posts: Post 레코드 목록
+
+    Returns:
+        Dict[str, List[str]]: 컬럼 이름 → 값 리스트
+    """
+    columns = {'title': [], 'url': [], 'published_date': [], 'platform': []}
+    for post in posts:
+        columns['title'].append(post.title)
+        columns['url'].append(post.url)
+        columns['published_date'].append(post.published_date)
+        columns['platform'].append(post.platform)
+    return columns
@@ -0,0 +1,132 @@
+"""
+SNS Content Tracker - Notion 조회 캐시
+
+Notion 데이터베이스 조회 응답을 로컬 SQLite 파일에 저장해
+같은 조회를 프로세스 안팎(수집 작업, 대시보드)에서 재사용합니다.
+TTL이 지난 항목은 버리고, 최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+
+# 기본 캐시 파일 경로
+DEFAULT_CACHE_PATH = "data/notion_cache.sqlite3"
+
+
+class QueryCache:
+    """Notion 조회 응답을 저장하는 TTL + LRU 디스크 캐시"""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        """
+        Args:
+            path: 캐시 파일 경로 (기본값: NOTION_CACHE_PATH 환경변수 또는 DEFAULT_CACHE_PATH)
+            ttl: 유효 시간 (초, 기본값: NOTION_CACHE_TTL 환경변수 또는 900, 0이면 캐시 비활성화)
+            max_entries: 최대 항목 수 (기본값: NOTION_CACHE_MAX_ENTRIES 환경변수 또는 256)
+        """
+        self.path = path or os.getenv("NOTION_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttl = ttl if ttl is not None else float(os.getenv("NOTION_CACHE_TTL", "900"))
+        self.max_entries = max_entries or int(os.getenv("NOTION_CACHE_MAX_ENTRIES", "256"))
+        self.conn = None
+
+        if not self.enabled:
+            return
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # 여러 프로세스가 같은 파일을 쓰므로 잠금 대기 시간을 둠
+            self.conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    database_id TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self.conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Notion 조회 캐시를 열 수 없습니다 (캐시 없이 진행): {e}")
+            self.conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def make_key(database_id: str, url: str, body: Dict) -> str:
+        """데이터베이스, 요청 URL(속성 선택 포함), 필터/정렬/커서로 캐시 키를 만듭니다."""
+        raw = json.dumps([database_id, url, body], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        캐시된 응답을 반환합니다.
+
+        Returns:
+            Optional[Dict]: 응답 (없거나 만료되었으면 None)
+        """
+        if not self.conn:
+            return None
+
+        now = time.time()
+        try:
+            row = self.conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            response, created_at = row
+            if now - created_at > self.ttl:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+                return None
+
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            return json.loads(response)
+        except sqlite3.Error as e:
+            print(f"⚠️  캐시 읽기 실패: {e}")
+            return None
+
+    def set(self, key: str, database_id: str, response: Dict):
+        """응답을 저장하고, 만료 항목과 최대 개수를 넘는 항목을 정리합니다."""
+        if not self.conn:
+            return
+
+        now = time.time()
+        try:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, database_id, json.dumps(response, ensure_ascii=False), now, now)
+            )
+            self.conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            self.conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  캐시 저장 실패: {e}")
+
+    def invalidate(self, database_id: str):
+        """데이터베이스의 캐시 항목을 모두 지웁니다 (페이지 생성/수정 후 호출)."""
+        if not self.conn:
+            return
+
+        try:
+            self.conn.execute("DELETE FROM responses WHERE database_id = ?", (database_id,))
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  캐시 무효화 실패: {e}")
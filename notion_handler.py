@@ -1,13 +1,56 @@
 import os
+import time
 import requests
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from dotenv import load_dotenv
-from urllib.parse import urlparse, urlunparse
+from dedup import NearDuplicateIndex
+from models import Post, normalize_url
+from notion_cache import QueryCache
 
 # 환경 변수 로드
 load_dotenv()
 
+# 읽기 경로별로 요청할 속성 (filter_properties)
+POST_PROPERTIES = ("Title", "URL", "Published Date", "Platform")
+DEDUP_PROPERTIES = ("Title", "URL", "Published Date")
+
+# 429 응답 시 최대 재시도 횟수
+MAX_RATE_LIMIT_RETRIES = 5
+
+# 스키마 조회 실패 후 다시 시도하기까지 기다리는 시간 (초)
+SCHEMA_RETRY_SECONDS = 60
+
+_MISSING = (KeyError, IndexError, TypeError)
+
+
+def _read_title(props: Dict) -> str:
+    try:
+        return props["Title"]["title"][0]["plain_text"]
+    except _MISSING:
+        return ""
+
+
+def _read_url(props: Dict) -> str:
+    try:
+        return props["URL"]["url"] or ""
+    except _MISSING:
+        return ""
+
+
+def _read_date(props: Dict) -> str:
+    try:
+        return props["Published Date"]["date"]["start"]
+    except _MISSING:
+        return ""
+
+
+def _read_platform(props: Dict) -> str:
+    try:
+        return props["Platform"]["select"]["name"]
+    except _MISSING:
+        return ""
+
 class NotionHandler:
     """Notion API를 통해 콘텐츠 트래킹 데이터를 관리하는 클래스"""
     
@@ -24,6 +67,70 @@ class NotionHandler:
             "Notion-Version": "2022-06-28"
         }
         self.base_url = "https://api.notion.com/v1"
+        
+        # 연결 재사용을 위한 HTTP 세션
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        
+        # 중복 체크용 인덱스 (load_dedup_index 호출 전에는 None → 매번 Notion 조회)
+        self.url_index: Optional[Set[str]] = None
+        self.title_index: Optional[NearDuplicateIndex] = None
+        
+        # True이면 저장 직전에 Notion에서 제목을 다시 확인 (다른 샤드가 방금 쓴 페이지 대비)
+        self.recheck_titles = False
+        
+        # 페이지 생성 실패 횟수
+        self.write_failures = 0
+        
+        # 속성 이름 → 속성 ID (filter_properties용, 처음 조회 시 로드)
+        self._property_ids: Optional[Dict[str, str]] = None
+        self._property_ids_retry_at = 0.0
+        
+        # 조회 응답 디스크 캐시 (수집 작업과 대시보드가 공유)
+        self.cache = QueryCache()
+        
+        # 요청 속도 제한 (Notion 통합당 평균 초당 3회, NOTION_RATE_LIMIT로 조정)
+        self.rate_limit = float(os.getenv("NOTION_RATE_LIMIT", "3"))
+        self.min_interval = 1.0 / self.rate_limit
+        self._last_request = 0.0
+        self.request_count = 0
+        self.rate_limited_count = 0
+        
+        # 요청 타임아웃 (초, NOTION_TIMEOUT로 조정) - 응답 없는 연결이 작업을 멈추지 않도록
+        self.timeout = float(os.getenv("NOTION_TIMEOUT", "30"))
+    
+    def set_rate_share(self, shares: int):
+        """
+        요청 속도 예산을 shares개의 작업이 나눠 쓰도록 조정합니다.
+        
+        여러 샤드가 같은 Notion 통합을 동시에 쓸 때 합계가 rate_limit을 넘지 않게 합니다.
+        """
+        self.min_interval = max(shares, 1) / self.rate_limit
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        속도 제한을 지키며 Notion API를 호출합니다.
+        
+        요청 간격을 min_interval 이상으로 유지하고,
+        429 응답을 받으면 Retry-After만큼 기다린 뒤 재시도합니다.
+        timeout을 따로 지정하지 않으면 self.timeout을 사용합니다.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            wait = self._last_request + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request = time.monotonic()
+            self.request_count += 1
+            
+            response = self.session.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                return response
+            
+            self.rate_limited_count += 1
+            retry_after = float(response.headers.get("Retry-After", 1))
+            print(f"⏳ Notion 요청 한도 초과 (429): {retry_after:g}초 후 재시도")
+            time.sleep(retry_after)
     
     def normalize_url(self, url: str) -> str:
         """
@@ -32,26 +139,7 @@ class NotionHandler:
         - 소문자 변환
         - http/https 통일
         """
-        if not url:
-            return ""
-        
-        # URL 파싱
-        parsed = urlparse(url.lower().strip())
-        
-        # path에서 끝의 슬래시 제거
-        path = parsed.path.rstrip('/')
-        
-        # 재조립 (scheme, netloc, path만 사용)
-        normalized = urlunparse((
-            parsed.scheme or 'https',
-            parsed.netloc,
-            path,
-            '',  # params
-            '',  # query
-            ''   # fragment
-        ))
-        
-        return normalized
+        return normalize_url(url)
     
     def add_content(self, title: str, url: str, published_date: str, platform: str) -> bool:
         """
@@ -66,19 +154,42 @@ class NotionHandler:
         Returns:
             bool: 성공 여부
         """
-        # URL 정규화
-        normalized_url = self.normalize_url(url)
+        return self.add_post(Post(
+            title=title,
+            url=url,
+            published_date=published_date,
+            platform=platform
+        ))
+    
+    def add_post(self, post: Post) -> bool:
+        """
+        Post 레코드를 Notion 데이터베이스에 추가합니다.
+        
+        Args:
+            post: 추가할 포스트 (url_key는 이미 정규화되어 있음)
+        
+        Returns:
+            bool: 성공 여부
+        """
+        title = post.title
+        url = post.url
+        published_date = post.published_date
+        platform = post.platform
         
         # 중복 체크 (URL 기반)
-        if self.is_url_exists(normalized_url):
+        if self.is_url_exists(post.url_key):
             print(f"⏭️  이미 존재: {title[:50]}...")
             return False
         
-        # 추가 안전장치: 제목으로도 체크 (같은 날짜에 같은 제목이면 중복으로 간주)
+        # 추가 안전장치: 제목으로도 체크 (비슷한 날짜에 비슷한 제목이면 중복으로 간주)
         if self.is_title_exists(title, published_date):
             print(f"⏭️  중복 제목: {title[:50]}... ({published_date})")
             return False
         
+        if self.recheck_titles and self.is_title_in_notion(title, published_date):
+            print(f"⏭️  중복 제목 (다른 작업이 추가): {title[:50]}... ({published_date})")
+            return False
+        
         # Notion 페이지 생성
         create_url = f"{self.base_url}/pages"
         payload = {
@@ -100,11 +211,17 @@ class NotionHandler:
         }
         
         try:
-            response = requests.post(create_url, headers=self.headers, json=payload)
+            response = self._request("POST", create_url, json=payload)
             response.raise_for_status()
             print(f"✅ 추가: {title[:50]}...")
+            self.cache.invalidate(self.database_id)
+            if self.url_index is not None:
+                self.url_index.add(post.url_key)
+            if self.title_index is not None:
+                self.title_index.add(response.json()["id"], title, published_date)
             return True
         except requests.exceptions.RequestException as e:
+            self.write_failures += 1
             print(f"❌ 추가 실패: {title[:50]}...")
             print(f"   에러: {str(e)}")
             if hasattr(e, 'response') and hasattr(e.response, 'text'):
@@ -122,21 +239,20 @@ class NotionHandler:
         Returns:
             bool: 존재 여부
         """
-        # 데이터베이스의 모든 페이지 가져오기 (필터 없이)
-        query_url = f"{self.base_url}/databases/{self.database_id}/query"
+        # 인덱스가 로드되어 있으면 메모리에서 확인
+        if self.url_index is not None:
+            return url in self.url_index
         
+        # 데이터베이스의 모든 페이지 가져오기 (필터 없이, URL 속성만)
         try:
-            response = requests.post(query_url, headers=self.headers, json={})
-            response.raise_for_status()
-            results = response.json().get("results", [])
+            results = self._query({}, properties=("URL",), use_cache=False).get("results", [])
             
             # 각 결과의 URL을 정규화해서 비교
             for page in results:
-                props = page.get("properties", {})
-                existing_url = props.get("URL", {}).get("url", "")
+                existing_url = _read_url(page["properties"])
                 
                 if existing_url:
-                    normalized_existing = self.normalize_url(existing_url)
+                    normalized_existing = normalize_url(existing_url)
                     if normalized_existing == url:
                         return True
             
@@ -151,6 +267,9 @@ class NotionHandler:
         """
         같은 날짜에 같은 제목이 이미 존재하는지 확인합니다.
         
+        유사 제목 인덱스가 로드되어 있으면 Notion을 조회하지 않고,
+        설정된 날짜 범위 안의 유사한 제목(교차 게시, 약간 수정된 제목)까지 찾습니다.
+        
         Args:
             title: 확인할 제목
             published_date: 발행일
@@ -158,7 +277,8 @@ class NotionHandler:
         Returns:
             bool: 존재 여부
         """
-        query_url = f"{self.base_url}/databases/{self.database_id}/query"
+        if self.title_index is not None:
+            return self.title_index.find(title, published_date) is not None
         
         try:
             # 같은 날짜의 페이지 조회
@@ -171,16 +291,11 @@ class NotionHandler:
                 }
             }
             
-            response = requests.post(query_url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            results = response.json().get("results", [])
+            results = self._query(payload, properties=("Title",), use_cache=False).get("results", [])
             
             # 각 결과의 제목 비교
             for page in results:
-                props = page.get("properties", {})
-                existing_title = ""
-                if props.get("Title", {}).get("title"):
-                    existing_title = props["Title"]["title"][0]["text"]["content"]
+                existing_title = _read_title(page["properties"])
                 
                 if existing_title.strip().lower() == title.strip().lower():
                     return True
@@ -191,20 +306,180 @@ class NotionHandler:
             print(f"⚠️  제목 중복 체크 실패: {str(e)}")
             return False
     
-    def get_all_contents(self, days: int = 365) -> List[Dict]:
+    def is_title_in_notion(self, title: str, published_date: str) -> bool:
+        """
+        발행일 범위 안의 제목을 Notion에서 직접 조회해 유사 제목이 있는지 확인합니다.
+        
+        메모리 인덱스를 만든 뒤 다른 작업(다른 샤드 등)이 추가한 페이지는 인덱스에 없으므로,
+        저장 직전에 캐시 없이 다시 확인합니다. 비교 기준은 유사 제목 인덱스와 같습니다.
+        
+        Args:
+            title: 확인할 제목
+            published_date: 발행일
+        
+        Returns:
+            bool: 존재 여부 (발행일을 알 수 없거나 조회에 실패하면 False)
+        """
+        try:
+            day = date.fromisoformat(published_date[:10])
+        except (TypeError, ValueError):
+            return False
+        
+        index = NearDuplicateIndex.from_env()
+        window = timedelta(days=index.window_days)
+        payload = {
+            "filter": {
+                "and": [
+                    {"property": "Published Date",
+                     "date": {"on_or_after": (day - window).isoformat()}},
+                    {"property": "Published Date",
+                     "date": {"on_or_before": (day + window).isoformat()}}
+                ]
+            }
+        }
+        
+        try:
+            pages = self._query_pages(payload, ("Title", "Published Date"), use_cache=False)
+            for page in pages:
+                props = page["properties"]
+                index.add(page["id"], _read_title(props), _read_date(props))
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️  제목 재확인 실패: {str(e)}")
+            return False
+        
+        return index.find(title, published_date) is not None
+    
+    def _get_property_ids(self) -> Dict[str, str]:
+        """
+        데이터베이스 스키마에서 속성 이름 → 속성 ID 매핑을 가져옵니다 (한 번만 조회).
+        
+        스키마 조회에 실패하면 빈 dict를 반환해 속성 선택 없이 조회하도록 하고,
+        실패는 저장하지 않아 SCHEMA_RETRY_SECONDS 후의 조회에서 다시 시도합니다.
+        """
+        if self._property_ids is not None:
+            return self._property_ids
+        if time.monotonic() < self._property_ids_retry_at:
+            return {}
+        
+        try:
+            response = self._request("GET", f"{self.base_url}/databases/{self.database_id}")
+            response.raise_for_status()
+            schema = response.json().get("properties", {})
+            self._property_ids = {name: prop["id"] for name, prop in schema.items()}
+            return self._property_ids
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️  데이터베이스 스키마 조회 실패 (전체 속성 조회): {str(e)}")
+            self._property_ids_retry_at = time.monotonic() + SCHEMA_RETRY_SECONDS
+            return {}
+    
+    def _query(self, body: Dict, properties: Optional[Tuple[str, ...]] = None,
+               use_cache: bool = True) -> Dict:
+        """
+        데이터베이스 쿼리를 한 번 실행합니다.
+        
+        Args:
+            body: 쿼리 본문 (filter, sorts, start_cursor 등)
+            properties: 응답에 포함할 속성 이름 (None이면 전체 속성)
+            use_cache: 디스크 캐시 사용 여부 (중복 체크처럼 최신 값이 필요하면 False)
+        
+        Returns:
+            Dict: 쿼리 응답
+        """
+        query_url = f"{self.base_url}/databases/{self.database_id}/query"
+        
+        if properties:
+            property_ids = self._get_property_ids()
+            if all(name in property_ids for name in properties):
+                # 속성 ID는 이미 URL 인코딩된 값이므로 그대로 붙임
+                query_url += "?" + "&".join(
+                    f"filter_properties={property_ids[name]}" for name in properties
+                )
+        
+        cache_key = None
+        if use_cache and self.cache.enabled:
+            cache_key = QueryCache.make_key(self.database_id, query_url, body)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        response = self._request("POST", query_url, json=body)
+        response.raise_for_status()
+        data = response.json()
+        
+        if cache_key:
+            self.cache.set(cache_key, self.database_id, data)
+        return data
+    
+    def _query_pages(self, payload: Dict, properties: Optional[Tuple[str, ...]] = None,
+                     use_cache: bool = True, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        데이터베이스 쿼리 결과를 페이지네이션하며 하나씩 반환합니다.
+        
+        Args:
+            payload: 쿼리 본문 (filter, sorts 등)
+            properties: 응답에 포함할 속성 이름 (None이면 전체 속성)
+            use_cache: 디스크 캐시 사용 여부
+            limit: 최대 페이지 수 (None이면 전체)
+        
+        Yields:
+            Dict: Notion 페이지 객체
+        """
+        body = dict(payload, page_size=min(limit or 100, 100))
+        remaining = limit
+        
+        while True:
+            data = self._query(body, properties, use_cache)
+            results = data.get("results", [])
+            
+            if remaining is not None:
+                results = results[:remaining]
+                remaining -= len(results)
+            
+            yield from results
+            
+            if not data.get("has_more") or remaining == 0:
+                break
+            body["start_cursor"] = data.get("next_cursor")
+    
+    def clear_cache(self):
+        """이 데이터베이스의 조회 캐시를 비웁니다."""
+        self.cache.invalidate(self.database_id)
+    
+    def _page_to_post(self, page: Dict) -> Post:
+        """
+        Notion 페이지 객체에서 Post 레코드를 추출합니다.
+        
+        조회에서 제외된 속성은 빈 문자열이 됩니다.
+        
+        Args:
+            page: Notion 페이지 객체
+        
+        Returns:
+            Post: 콘텐츠 레코드
+        """
+        props = page["properties"]
+        
+        return Post(
+            title=_read_title(props),
+            url=_read_url(props),
+            published_date=_read_date(props),
+            platform=_read_platform(props)
+        )
+    
+    def get_all_contents(self, days: int = 365, limit: Optional[int] = None) -> List[Post]:
         """
         최근 N일간의 모든 콘텐츠를 가져옵니다.
         
         Args:
             days: 조회할 일수 (기본 365일)
+            limit: 최대 개수 (발행일 내림차순, None이면 전체)
         
         Returns:
-            List[Dict]: 콘텐츠 목록
+            List[Post]: 콘텐츠 목록
         """
         from datetime import datetime, timedelta
         
         start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        query_url = f"{self.base_url}/databases/{self.database_id}/query"
         
         payload = {
             "filter": {
@@ -222,36 +497,10 @@ class NotionHandler:
         }
         
         try:
-            response = requests.post(query_url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            results = response.json().get("results", [])
-            
-            # 데이터 파싱
-            contents = []
-            for page in results:
-                props = page.get("properties", {})
-                
-                # 각 속성 안전하게 추출
-                title = ""
-                if props.get("Title", {}).get("title"):
-                    title = props["Title"]["title"][0]["text"]["content"]
-                
-                url = props.get("URL", {}).get("url", "")
-                
-                published_date = ""
-                if props.get("Published Date", {}).get("date"):
-                    published_date = props["Published Date"]["date"]["start"]
-                
-                platform = ""
-                if props.get("Platform", {}).get("select"):
-                    platform = props["Platform"]["select"]["name"]
-                
-                contents.append({
-                    "title": title,
-                    "url": url,
-                    "published_date": published_date,
-                    "platform": platform
-                })
+            contents = [
+                self._page_to_post(page)
+                for page in self._query_pages(payload, properties=POST_PROPERTIES, limit=limit)
+            ]
             
             print(f"📊 총 {len(contents)}개의 콘텐츠를 가져왔습니다.")
             return contents
@@ -259,7 +508,87 @@ class NotionHandler:
         except requests.exceptions.RequestException as e:
             print(f"❌ 데이터 조회 실패: {str(e)}")
             return []
+    
+    def get_pages_edited_since(self, since: Optional[str] = None,
+                               properties: Tuple[str, ...] = POST_PROPERTIES,
+                               use_cache: bool = True
+                               ) -> Iterator[Tuple[str, str, Post]]:
+        """
+        지정한 시각 이후 수정된 페이지들을 가져옵니다 (로컬 미러 증분 동기화용).
+        
+        데이터베이스 조회는 보관/휴지통/삭제된 페이지를 반환하지 않으므로,
+        이런 페이지를 반영하려면 since 없이 전체를 다시 조회해야 합니다.
+        
+        Args:
+            since: ISO 8601 시각 (None이면 전체 조회)
+            properties: 응답에 포함할 속성 이름 (기본: Post의 네 속성)
+            use_cache: 디스크 캐시 사용 여부
+        
+        Yields:
+            Tuple[str, str, Post]: (페이지 ID, last_edited_time, 콘텐츠)
+        """
+        payload = {
+            "sorts": [
+                {
+                    "timestamp": "last_edited_time",
+                    "direction": "ascending"
+                }
+            ]
+        }
+        if since:
+            payload["filter"] = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {
+                    "on_or_after": since
+                }
+            }
+        
+        for page in self._query_pages(payload, properties=properties, use_cache=use_cache):
+            yield page["id"], page.get("last_edited_time", ""), self._page_to_post(page)
 
+    
+    def load_dedup_index(self, since: Optional[str] = None) -> Optional[str]:
+        """
+        데이터베이스의 URL과 제목을 메모리 중복 체크 인덱스로 불러옵니다.
+        
+        인덱스가 로드되면 is_url_exists / is_title_exists는 Notion을 조회하지 않습니다.
+        since를 주면 그 이후 수정된 페이지만 가져와 기존 인덱스에 더합니다.
+        증분 조회로는 Notion에서 보관/삭제된 페이지를 알 수 없으므로, 오래 유지하는
+        인덱스는 url_index / title_index를 None으로 비운 뒤 since 없이 다시 불러와야 합니다
+        (데몬은 DAEMON_INDEX_REBUILD_HOURS마다 재구성).
+        유사 제목 기준은 TITLE_DEDUP_THRESHOLD(기본 0.8),
+        TITLE_DEDUP_WINDOW_DAYS(기본 1일) 환경변수로 조정합니다.
+        
+        Args:
+            since: ISO 8601 시각 (None이면 전체 조회)
+        
+        Returns:
+            Optional[str]: 반영한 페이지 중 가장 늦은 last_edited_time (다음 호출의 since)
+        """
+        # 조회가 중간에 실패하면 불완전한 인덱스가 쓰이지 않도록 모두 받은 뒤 반영
+        url_keys = set()
+        titles = []
+        latest = since
+        pages = self.get_pages_edited_since(since, DEDUP_PROPERTIES, use_cache=False)
+        for page_id, edited_time, post in pages:
+            if post.url_key:
+                url_keys.add(post.url_key)
+            titles.append((page_id, post.title, post.published_date))
+            if edited_time and (latest is None or edited_time > latest):
+                latest = edited_time
+        
+        if self.url_index is None:
+            self.url_index = url_keys
+        else:
+            self.url_index |= url_keys
+        
+        # 페이지 ID로 관리하므로 다시 조회된 페이지(제목 수정 포함)는 기존 엔트리를 교체
+        if self.title_index is None:
+            self.title_index = NearDuplicateIndex.from_env()
+        for page_id, title, published_date in titles:
+            self.title_index.add(page_id, title, published_date)
+        
+        return latest
 
 # 테스트 코드
 if __name__ == "__main__":
@@ -283,4 +612,4 @@ if __name__ == "__main__":
     print("\n=== 최근 콘텐츠 조회 ===")
     contents = handler.get_all_contents(days=30)
     for content in contents[:5]:  # 최근 5개만 출력
-        print(f"- {content['title']} ({content['platform']}) - {content['published_date']}")
+        print(f"- {content.title} ({content.platform}) - {content.published_date}")
@@ -0,0 +1,139 @@
+"""
+SNS Content Tracker - 적응형 수집 스케줄러
+
+블로그별 발행 주기를 학습해 다음 수집 시각을 정하고,
+실행 시점에 수집할 차례가 된 블로그만 골라냅니다.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from statistics import median
+from typing import Dict, List, Optional
+from models import Post
+
+# 기본 스케줄 상태 파일 경로
+DEFAULT_SCHEDULE_PATH = "data/schedule.json"
+
+# cron 실행 시각이 조금씩 밀려도 한 주기를 건너뛰지 않도록 두는 여유
+DUE_SLACK = timedelta(minutes=10)
+
+
+class PollScheduler:
+    """블로그별 발행 주기에 맞춰 RSS 수집 시점을 정하는 클래스"""
+
+    def __init__(self, path: Optional[str] = None, min_interval_hours: float = None,
+                 max_staleness_hours: float = None):
+        """
+        Args:
+            path: 상태 파일 경로 (기본값: SCHEDULE_PATH 환경변수 또는 DEFAULT_SCHEDULE_PATH)
+            min_interval_hours: 최소 수집 간격 (기본값: MIN_POLL_HOURS 환경변수 또는 1시간)
+            max_staleness_hours: 최대 수집 간격 (기본값: MAX_STALENESS_HOURS 환경변수 또는 24시간)
+        """
+        self.path = path or os.getenv("SCHEDULE_PATH", DEFAULT_SCHEDULE_PATH)
+        self.min_interval = timedelta(
+            hours=min_interval_hours or float(os.getenv("MIN_POLL_HOURS", "1"))
+        )
+        self.max_staleness = timedelta(
+            hours=max_staleness_hours or float(os.getenv("MAX_STALENESS_HOURS", "24"))
+        )
+        self.state = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """상태 파일을 읽어옵니다 (없거나 손상되면 빈 상태)."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """상태 파일을 저장합니다."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def is_due(self, blog_url: str, now: Optional[datetime] = None) -> bool:
+        """
+        블로그를 지금 수집해야 하는지 확인합니다.
+
+        처음 보는 블로그는 항상 수집 대상입니다.
+        """
+        entry = self.state.get(blog_url)
+        if not entry:
+            return True
+
+        now = now or self._now()
+        return datetime.fromisoformat(entry["next_due"]) <= now + DUE_SLACK
+
+    def due_blogs(self, blog_urls: List[str], now: Optional[datetime] = None) -> List[str]:
+        """
+        수집할 차례가 된 블로그만 골라 반환합니다.
+
+        Args:
+            blog_urls: 전체 블로그 URL 목록
+            now: 기준 시각 (기본값: 현재 UTC)
+
+        Returns:
+            List[str]: 수집 대상 블로그 URL 목록
+        """
+        now = now or self._now()
+        return [url for url in blog_urls if self.is_due(url, now)]
+
+    def _poll_interval(self, posts: List[Post], now: datetime) -> Optional[timedelta]:
+        """
+        최근 포스트들의 발행 간격으로 수집 간격을 계산합니다.
+
+        발행 간격의 중앙값과 마지막 발행 이후 경과 시간 중 큰 값의 절반을 사용해
+        자주 쓰는 블로그는 자주, 휴면 블로그는 드물게 수집합니다.
+        """
+        published = sorted(
+            (datetime.fromisoformat(post.published_date).replace(tzinfo=timezone.utc)
+             for post in posts if post.published_date),
+            reverse=True
+        )
+        if len(published) < 2:
+            return None
+
+        gaps = [newer - older for newer, older in zip(published, published[1:])][:10]
+        typical_gap = max(median(gaps), now - published[0])
+
+        return min(max(typical_gap / 2, self.min_interval), self.max_staleness)
+
+    def record(self, blog_url: str, posts: List[Post], now: Optional[datetime] = None) -> datetime:
+        """
+        수집 결과를 반영해 블로그의 다음 수집 시각을 정합니다.
+
+        포스트가 부족해 주기를 알 수 없으면 이전 간격을 유지하고,
+        이전 기록도 없으면 최대 간격을 사용합니다.
+
+        Args:
+            blog_url: 블로그 URL
+            posts: 이번에 수집한 포스트 목록
+            now: 기준 시각 (기본값: 현재 UTC)
+
+        Returns:
+            datetime: 다음 수집 시각
+        """
+        now = now or self._now()
+        interval = self._poll_interval(posts, now)
+
+        if interval is None:
+            previous = self.state.get(blog_url, {}).get("interval_hours")
+            interval = timedelta(hours=previous) if previous else self.max_staleness
+
+        next_due = now + interval
+        self.state[blog_url] = {
+            "last_fetched": now.isoformat(),
+            "next_due": next_due.isoformat(),
+            "interval_hours": round(interval.total_seconds() / 3600, 2),
+        }
+        return next_due
@@ -1,7 +1,10 @@
+import os
 import feedparser
+import requests
 from datetime import datetime
-from typing import List, Dict
+from typing import List
 from urllib.parse import urlparse
+from models import Post
 
 class TistoryScraper:
     """티스토리 블로그의 RSS 피드를 파싱하는 클래스"""
@@ -21,6 +24,17 @@ class TistoryScraper:
             blog_name = self._extract_blog_name(blog_url)
         
         self.platform = f"Tistory ({blog_name})"
+        
+        # 조건부 요청용 피드 검증값 (ETag / Last-Modified)
+        self.etag = None
+        self.modified = None
+        self.not_modified = False
+        
+        # 연결 재사용을 위한 HTTP 세션과 요청 타임아웃 (초, FEED_TIMEOUT로 조정)
+        self.session = requests.Session()
+        self.timeout = float(os.getenv("FEED_TIMEOUT", "15"))
+        # 마지막 수집이 오류로 끝났는지 여부 (빈 피드와 구분)
+        self.fetch_failed = False
     
     def _extract_blog_name(self, url: str) -> str:
         """
@@ -43,15 +57,24 @@ class TistoryScraper:
         except:
             return 'tistory'
     
-    def fetch_posts(self, limit: int = 50) -> List[Dict]:
+    def reset_validators(self):
+        """피드 검증값을 초기화해 다음 요청에서 피드 전체를 다시 받도록 합니다."""
+        self.etag = None
+        self.modified = None
+    
+    def fetch_posts(self, limit: int = 50) -> List[Post]:
         """
         RSS 피드에서 최신 포스트들을 가져옵니다.
         
+        이전 응답의 ETag / Last-Modified 값이 있으면 조건부 요청을 보내고,
+        피드가 바뀌지 않았으면(304) 빈 리스트를 반환합니다 (not_modified=True).
+        요청이나 파싱에 실패해도 빈 리스트를 반환하며, 이때는 fetch_failed=True입니다.
+        
         Args:
             limit: 가져올 최대 포스트 수 (기본 50개)
         
         Returns:
-            List[Dict]: 포스트 정보 리스트
+            List[Post]: 포스트 레코드 리스트
                 - title: 제목
                 - url: URL
                 - published_date: 발행일 (YYYY-MM-DD 형식)
@@ -61,16 +84,36 @@ class TistoryScraper:
         
         try:
             # RSS 피드 파싱
-            feed = feedparser.parse(self.rss_url)
+            self.not_modified = False
+            self.fetch_failed = False
+            headers = {}
+            if self.etag:
+                headers['If-None-Match'] = self.etag
+            if self.modified:
+                headers['If-Modified-Since'] = self.modified
+            
+            response = self.session.get(self.rss_url, headers=headers, timeout=self.timeout)
+            
+            if response.status_code == 304:
+                self.not_modified = True
+                print(f"⏭️  피드 변경 없음 (304)")
+                return []
+            
+            response.raise_for_status()
+            feed = feedparser.parse(response.content)
             
             if feed.bozo:  # 파싱 에러가 있는 경우
                 print(f"⚠️  RSS 피드 파싱 오류: {feed.bozo_exception}")
+                self.fetch_failed = True
                 return []
             
             if not feed.entries:
                 print(f"⚠️  피드에 포스트가 없습니다.")
                 return []
             
+            self.etag = response.headers.get('ETag')
+            self.modified = response.headers.get('Last-Modified')
+            
             posts = []
             for entry in feed.entries[:limit]:
                 # 제목
@@ -83,18 +126,19 @@ class TistoryScraper:
                 published_date = self._parse_date(entry)
                 
                 if url and published_date:
-                    posts.append({
-                        'title': title,
-                        'url': url,
-                        'published_date': published_date,
-                        'platform': self.platform
-                    })
+                    posts.append(Post(
+                        title=title,
+                        url=url,
+                        published_date=published_date,
+                        platform=self.platform
+                    ))
             
             print(f"✅ {len(posts)}개의 포스트를 찾았습니다.")
             return posts
             
         except Exception as e:
             print(f"❌ RSS 피드 가져오기 실패: {str(e)}")
+            self.fetch_failed = True
             return []
     
     def _parse_date(self, entry) -> str:
@@ -120,7 +164,7 @@ class TistoryScraper:
         # 파싱 실패 시 None 반환
         return None
     
-    def get_recent_posts(self, days: int = 30) -> List[Dict]:
+    def get_recent_posts(self, days: int = 30) -> List[Post]:
         """
         최근 N일 이내의 포스트만 필터링하여 반환합니다.
         
@@ -128,7 +172,7 @@ class TistoryScraper:
             days: 조회할 일수 (기본 30일)
         
         Returns:
-            List[Dict]: 최근 포스트 정보 리스트
+            List[Post]: 최근 포스트 레코드 리스트
         """
         from datetime import timedelta
         
@@ -137,7 +181,7 @@ class TistoryScraper:
         
         recent_posts = [
             post for post in all_posts 
-            if post['published_date'] >= cutoff_date
+            if post.published_date >= cutoff_date
         ]
         
         print(f"📅 최근 {days}일 이내 포스트: {len(recent_posts)}개")
@@ -161,8 +205,8 @@ if __name__ == "__main__":
     if posts:
         print(f"\n📝 최근 포스트 목록:")
         for i, post in enumerate(posts, 1):
-            print(f"{i}. {post['title']}")
-            print(f"   URL: {post['url']}")
-            print(f"   날짜: {post['published_date']}\n")
+            print(f"{i}. {post.title}")
+            print(f"   URL: {post.url}")
+            print(f"   날짜: {post.published_date}\n")
     else:
         print("\n⚠️  포스트를 가져올 수 없습니다.")
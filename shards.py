@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+SNS Content Tracker - 블로그 샤딩
+
+블로그 목록을 안정적인 해시로 N개 샤드에 나누고,
+샤드별 결과 리포트를 저장/병합합니다.
+
+사용법:
+    python main.py --shard 1/4            # 4개 중 첫 번째 샤드 실행
+    python shards.py merge reports        # 샤드 리포트 병합
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+from typing import Dict, List, Tuple
+from models import normalize_url
+
+# 기본 리포트 디렉터리
+DEFAULT_REPORT_DIR = "reports"
+
+# 병합 시 합산하는 리포트 항목
+SUMMED_FIELDS = ("new", "existing", "errors", "notion_requests", "rate_limited")
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    'i/N' 형식의 샤드 지정을 파싱합니다 (1 ≤ i ≤ N).
+
+    Returns:
+        Tuple[int, int]: (샤드 번호, 전체 샤드 수)
+    """
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"샤드는 i/N 형식이어야 합니다: {value}")
+
+    if not 1 <= index <= total:
+        raise argparse.ArgumentTypeError(f"샤드 번호는 1 이상 {total} 이하여야 합니다: {value}")
+    return index, total
+
+
+def shard_of(blog_url: str, total: int) -> int:
+    """
+    블로그가 속한 샤드 번호(1부터)를 반환합니다.
+
+    실행 환경과 무관하게 같은 결과가 나오도록 정규화된 URL의 SHA-1을 사용합니다.
+    """
+    digest = hashlib.sha1(normalize_url(blog_url).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % total + 1
+
+
+def select_shard(blog_urls: List[str], index: int, total: int) -> List[str]:
+    """블로그 목록에서 지정한 샤드에 속한 블로그만 골라 반환합니다."""
+    return [url for url in blog_urls if shard_of(url, total) == index]
+
+
+def report_path(index: int, total: int, directory: str = DEFAULT_REPORT_DIR) -> str:
+    """샤드 리포트 파일 경로를 반환합니다."""
+    return os.path.join(directory, f"shard-{index}-of-{total}.json")
+
+
+def write_report(path: str, report: Dict):
+    """샤드 리포트를 JSON 파일로 저장합니다."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def merge_reports(paths: List[str]) -> Dict:
+    """
+    샤드 리포트들을 하나로 병합합니다.
+
+    Args:
+        paths: 리포트 파일 경로 목록
+
+    Returns:
+        Dict: 병합 결과 (합산 항목, 블로그 목록, 샤드별 소요 시간, 누락 샤드)
+    """
+    merged = {field: 0 for field in SUMMED_FIELDS}
+    merged["blogs"] = []
+    merged["shards"] = {}
+
+    total_shards = 0
+    for path in sorted(paths):
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+
+        for field in SUMMED_FIELDS:
+            merged[field] += report.get(field, 0)
+        merged["blogs"].extend(report.get("blogs", []))
+        merged["shards"][str(report["shard"])] = report.get("duration_seconds", 0)
+        total_shards = max(total_shards, report.get("total_shards", 0))
+
+    merged["total_shards"] = total_shards
+    merged["missing_shards"] = [
+        index for index in range(1, total_shards + 1) if str(index) not in merged["shards"]
+    ]
+    return merged
+
+
+def main():
+    """샤드 리포트 병합 명령을 실행합니다."""
+    parser = argparse.ArgumentParser(description="샤드 리포트 병합")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    merge_parser = subparsers.add_parser("merge", help="샤드 리포트 병합")
+    merge_parser.add_argument("directory", nargs="?", default=DEFAULT_REPORT_DIR,
+                              help="리포트 디렉터리 (기본 reports)")
+    merge_parser.add_argument("--output", help="병합 결과 저장 경로")
+
+    args = parser.parse_args()
+
+    paths = glob.glob(os.path.join(args.directory, "**", "shard-*.json"), recursive=True)
+    if not paths:
+        print(f"⚠️  샤드 리포트가 없습니다: {args.directory}")
+        raise SystemExit(1)
+
+    merged = merge_reports(paths)
+
+    print("=" * 60)
+    print(f"📊 샤드 {len(merged['shards'])}/{merged['total_shards']}개 병합 완료")
+    print(f"   📘 블로그: {len(merged['blogs'])}개")
+    print(f"   ✅ 새로 추가: {merged['new']}개")
+    print(f"   ⏭️  이미 존재: {merged['existing']}개")
+    print(f"   ❌ 오류 발생: {merged['errors']}개")
+    print(f"   🌐 Notion 요청: {merged['notion_requests']}회 (429: {merged['rate_limited']}회)")
+    for shard, duration in sorted(merged["shards"].items(), key=lambda item: int(item[0])):
+        print(f"   ⏱️  샤드 {shard}: {duration}초")
+    if merged["missing_shards"]:
+        print(f"   ⚠️  누락된 샤드: {', '.join(map(str, merged['missing_shards']))}")
+    print("=" * 60)
+
+    if args.output:
+        write_report(args.output, merged)
+
+    if merged["missing_shards"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()